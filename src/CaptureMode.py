@@ -1,6 +1,6 @@
 from PyQt6 import QtWidgets, QtMultimedia
 from PyQt6.QtCore import pyqtSlot, QThread, QObject, pyqtSignal, Qt, QSize, QUrl, QAbstractTableModel, QAbstractListModel, QItemSelection, QModelIndex, QRunnable, QThreadPool, QTimer
-from PyQt6.QtGui import QAction, QIcon, QKeySequence, QColor, QStandardItemModel, QStandardItem, QPixmap, QPen, QCloseEvent, QGuiApplication
+from PyQt6.QtGui import QAction, QIcon, QKeySequence, QColor, QStandardItemModel, QStandardItem, QPixmap, QPen, QCloseEvent, QGuiApplication, QOpenGLContext
 from PyQt6.QtMultimedia import QMediaDevices, QCamera, QMediaCaptureSession, QCameraDevice, QCameraFormat, QWindowCapture, QCapturableWindow, QScreenCapture, QMediaRecorder
 from PyQt6.QtMultimediaWidgets import QVideoWidget
 
@@ -41,12 +41,18 @@ from typing import Literal
 
 
 class UDPWorker(QRunnable):
-    """Listens to a single UDP socket and emits the bytes collected from a UDP packet through the 'collected' signal"""
+    """Listens to a single UDP socket, transforms the packets collected into Forza Data Packets and emits them through
+    the 'collected' signal. Every packet waiting on the socket is read at once and emitted together as a list. Packets
+    are parsed on the worker's thread so the GUI thread only receives finished ForzaDataPacket objects"""
 
     class Signals(QObject):
         """Signals for the UDPWorker"""
         finished = pyqtSignal()
-        collected = pyqtSignal(bytes)
+        collected = pyqtSignal(list)  # Emits a list of the ForzaDataPacket objects read
+        invalidCollected = pyqtSignal(int)  # Emits the number of packets read that weren't Forza data packets
+
+    maxBatchSize = 64  # The most packets read from the socket before they are emitted
+    receiveBufferSize = 4 * 1024 * 1024  # The size of the socket's receive buffer in bytes
 
     def __init__(self, port:int):
         super().__init__()
@@ -54,8 +60,18 @@ class UDPWorker(QRunnable):
         self.working = True
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.setblocking(0)  # Set to non blocking, so the thread can be terminated without the socket blocking forever
+
+        # A larger receive buffer holds packets that arrive while the GUI is busy instead of dropping them
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.receiveBufferSize)
+        logging.debug("Socket receive buffer size: {}".format(self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)))
+
         self.socketTimeout = 1
         self.port = port
+        self._selectList = [self.sock]  # The sockets passed to select, built once rather than on every wait
+
+        # Every packet is read into the same buffer. Packets are parsed straight from it, so receiving doesn't allocate
+        self._buffer = bytearray(1024)
+        self._bufferView = memoryview(self._buffer)
 
     def run(self):
         """Binds the socket and starts listening for packets"""
@@ -67,16 +83,31 @@ class UDPWorker(QRunnable):
         logging.info("Started listening on port {}".format(self.port))
 
         while self.working:
-            try:
-                ready = select.select([self.sock], [], [], self.socketTimeout)
-                if ready[0]:
-                    data, address = self.sock.recvfrom(1024)
-                    logging.debug('received {} bytes from {}'.format(len(data), address))
-                    self.signals.collected.emit(data)
-                else:
-                    logging.debug("Socket timeout")
-            except BlockingIOError:
-                logging.info("Could not listen to {}, trying again...".format(address))
+            ready = select.select(self._selectList, [], [], self.socketTimeout)
+            if not ready[0]:
+                logging.debug("Socket timeout")
+                continue
+
+            # Drain the socket so a burst of packets costs one wake up and one signal instead of one per packet
+            packets = []
+            invalid = 0
+            while len(packets) + invalid < self.maxBatchSize:
+                try:
+                    size, address = self.sock.recvfrom_into(self._bufferView)
+                except BlockingIOError:
+                    break
+                # Dash packets have a fixed size, so anything else isn't a forza packet. Checking the length up front
+                # avoids raising and catching a struct error for every bad packet
+                if size != ForzaDataPacket.dash_struct.size:
+                    invalid += 1
+                    continue
+                packets.append(ForzaDataPacket(self._bufferView[:size]))
+
+            logging.debug('received {} packets, {} invalid'.format(len(packets), invalid))
+            if invalid:
+                self.signals.invalidCollected.emit(invalid)
+            if packets:
+                self.signals.collected.emit(packets)
         
         # Close the socket after the player wants to stop listening, so that
         # a new socket can be created using the same port next time
@@ -540,11 +571,13 @@ class TelemetryCapture(QObject):
     
     class Signals(QObject):
         collected = pyqtSignal(ForzaDataPacket)  # Emitted on collection of a forza data packet
+        collectedBatch = pyqtSignal(list)  # Emitted every batchInterval with the forza data packets collected since the last
         errorOccurred = pyqtSignal(object)  # Emits a TelemetryCapture.Error object
         activeChanged = pyqtSignal(bool)
         statusChanged = pyqtSignal(object)
         portChanged = pyqtSignal(int)
 
+    batchInterval = 50  # Milliseconds between each collectedBatch signal
 
     def __init__(self, parent = None, port = None):
         super().__init__(parent)
@@ -559,6 +592,13 @@ class TelemetryCapture(QObject):
         self._startTime: datetime.datetime = None  # The date and time that the object started recording
         self._endTime: datetime.datetime = None  # The date and time that the object stopped recording
 
+        # Packets waiting to be emitted through collectedBatch. Display widgets use the batches so they update a few
+        # times a second instead of for every packet
+        self._batch: list[ForzaDataPacket] = []
+        self._batchTimer = QTimer(self)
+        self._batchTimer.setInterval(self.batchInterval)
+        self._batchTimer.timeout.connect(self._emitBatch)
+
     def start(self):
         """Start capturing telemetry"""
         
@@ -574,8 +614,10 @@ class TelemetryCapture(QObject):
         self._worker = UDPWorker(self._port)
         self._worker.setAutoDelete(True)
         self._worker.signals.collected.connect(self._onCollected)
+        self._worker.signals.invalidCollected.connect(self._onInvalidCollected)
         self._worker.signals.finished.connect(self._onFinished)
         self._threadpool.start(self._worker)
+        self._batchTimer.start()
         self._setActive(True)
     
     def _setActive(self, active: bool):
@@ -589,30 +631,38 @@ class TelemetryCapture(QObject):
         self._active = active
         self.signals.activeChanged.emit(active)
         
-    def _onCollected(self, data: bytes):
-        """Called when a single UDP packet is collected. Receives the unprocessed
-        packet data, transforms it into a Forza Data Packet and emits the collected signal with
-        that forza data packet object. If packet cannot be read, it will emit an error signal"""
+    def _onCollected(self, packets: list):
+        """Called when a batch of Forza Data Packets is collected by the worker. Emits the collected signal with
+        each forza data packet object"""
 
-        fdp: ForzaDataPacket = None
-        try:
-            fdp = ForzaDataPacket(data)
-            self._setStatus(self.Status.Capturing)
+        self._setStatus(self.Status.Capturing)
+        self._batch.extend(packets)
+        for fdp in packets:
             self._packetsCollected += 1
             self.signals.collected.emit(fdp)
-        except:
-            # If it's not a forza packet
-            self._setStatus(self.Status.Listening)
-            self.signals.errorOccurred.emit(self.Error.BadPacketReceived)
-            self._invalidPacketsCollected += 1
 
-        if self._packetsCollected % 60 == 0:
-            logging.debug(f"Received {self._packetsCollected} packets.")
-        if self._invalidPacketsCollected % 60 == 0:
-            logging.debug(f"Received {self._invalidPacketsCollected} invalid packets.")
+            if self._packetsCollected % 60 == 0:
+                logging.debug(f"Received {self._packetsCollected} packets.")
+
+    def _onInvalidCollected(self, count: int):
+        """Called when the worker collects packets that can't be read as Forza Data Packets. Emits an error signal"""
+
+        self._setStatus(self.Status.Listening)
+        self.signals.errorOccurred.emit(self.Error.BadPacketReceived)
+        self._invalidPacketsCollected += count
+        logging.debug(f"Received {self._invalidPacketsCollected} invalid packets.")
+
+    def _emitBatch(self):
+        """Emits the packets collected since the last batch, if there are any"""
+        if self._batch:
+            batch = self._batch
+            self._batch = []
+            self.signals.collectedBatch.emit(batch)
 
     def _onFinished(self):
         """Cleans up after the worker has stopped listening to packets"""
+        self._batchTimer.stop()
+        self._emitBatch()
         self._setActive(False)
         self._setStatus(self.Status.NotListening)
 
@@ -961,6 +1011,39 @@ class CaptureOverview(QtWidgets.QFrame):
         return self.videoPreview
 
 
+class LineBuffer():
+    """Preallocated buffers holding the points of a single live line. Points are written into them in place and the
+    line is given views of the filled part, so appending doesn't reallocate the whole line. The buffers double in size
+    when they are full. X values are kept as float64 so large values like timestamp_ms keep their precision"""
+
+    initialSize = 4096  # The number of points the buffers can hold before they need to grow
+
+    def __init__(self):
+        self._x = np.empty(self.initialSize, dtype=np.float64)
+        self._y = np.empty(self.initialSize, dtype=np.float32)
+        self._length = 0
+
+    def append(self, xs, ys):
+        """Appends points to the buffers, growing them if they are too small"""
+        xs = np.asarray(xs, dtype=np.float64)
+        end = self._length + xs.shape[0]
+        if end > self._x.shape[0]:
+            size = max(self._x.shape[0] * 2, end)
+            self._x = np.concatenate((self._x[:self._length], np.empty(size - self._length, dtype=np.float64)))
+            self._y = np.concatenate((self._y[:self._length], np.empty(size - self._length, dtype=np.float32)))
+        self._x[self._length:end] = xs
+        self._y[self._length:end] = ys
+        self._length = end
+
+    def points(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns views of the points held in the buffers, to be passed to PlotDataItem.setData"""
+        return self._x[:self._length], self._y[:self._length]
+
+    def clear(self):
+        """Empties the buffers without freeing them"""
+        self._length = 0
+
+
 class TelemetryPlotItem(pg.PlotItem):
 
     wantToClose = pyqtSignal(int)  # Emitted when the close action has been triggered
@@ -972,6 +1055,15 @@ class TelemetryPlotItem(pg.PlotItem):
         # it is associated with
         self.lineDict = {}
         self.id = id  # The id of the plot, passed to the close signal
+
+        # Only draw the points that are in view, and at most a few per pixel, so long sessions stay responsive
+        self.setDownsampling(auto=True, mode="peak")
+        self.setClipToView(True)
+
+        # A dictionary of tuples : LineBuffer, holding the points of each line in lineDict that is added to with
+        # appendPoints. Buffers are only created the first time a line is given points
+        self._lineBuffers = {}
+
         vb = self.getViewBox()
         closeAction = vb.menu.addAction("Close")
         closeAction.triggered.connect(self.closing)
@@ -980,6 +1072,27 @@ class TelemetryPlotItem(pg.PlotItem):
         logging.info("Closing...")
         self.wantToClose.emit(self.id)
     
+    def appendPoints(self, key: tuple, xs, ys):
+        """Appends points to the line identified by key, creating the line if it doesn't exist yet. Subclasses can
+        call this from addData to draw live data"""
+        buffer = self._lineBuffers.get(key)
+        if buffer is None:
+            buffer = LineBuffer()
+            self._lineBuffers[key] = buffer
+        buffer.append(xs, ys)
+
+        line = self.lineDict.get(key)
+        if line is None:
+            line = self.plot()
+            self.lineDict[key] = line
+        line.setData(*buffer.points())
+
+    def clearPoints(self):
+        """Empties the buffers of every line added to with appendPoints, without freeing them"""
+        for key, buffer in self._lineBuffers.items():
+            buffer.clear()
+            self.lineDict[key].setData(*buffer.points())
+    
     @abstractmethod
     def addData(self, data: ForzaDataPacket):
         """Adds new data to the plot when given a Forza Data Packet"""
@@ -992,12 +1105,25 @@ class TelemetryPlotItem(pg.PlotItem):
 class MultiPlotWidget(pg.GraphicsLayoutWidget):
     """Manages and displays multiple plots generated from the session data."""
 
-    def __init__(self, parent=None, show=False, size=None, title=None, **kargs):
+    def __init__(self, parent=None, show=False, size=None, title=None, openGL=True, **kargs):
         super().__init__(parent, show, size, title, **kargs)
 
+        # Draw the plots on an OpenGL viewport so long curves are rasterised by the GPU instead of QPainter. Falls back
+        # to the raster backend if an OpenGL context can't be created on this machine
+        if openGL and MultiPlotWidget.openGLAvailable():
+            self.useOpenGL(True)
+        elif openGL:
+            logging.info("OpenGL is not available, plots will use the raster backend.")
+
         self.nextid = 0  # The next ID to give to a plot
         self.plots = {}  # A dict of id (int) : plot (plotitem)
     
+    @staticmethod
+    def openGLAvailable() -> bool:
+        """Returns whether an OpenGL context can be created, so the plots can be drawn on an OpenGL viewport"""
+        context = QOpenGLContext()
+        return context.create()
+
     def reset(self):
         """Resets all the plots"""
         for plot in self.plots:
@@ -1382,7 +1508,7 @@ class TelemetryCaptureSettingsWidget(QtWidgets.QWidget):
         self._telemetryCapture = TelemetryCapture()
         self._telemetryCapture.setPort(self._portSpinBox.value())
         self._telemetryCapture.signals.activeChanged.connect(self.onActiveChanged)
-        self._telemetryCapture.signals.collected.connect(self.onCollected)
+        self._telemetryCapture.signals.collectedBatch.connect(self.onCollected)
         self._portSpinBox.valueChanged.connect(self._telemetryCapture.setPort)
 
         # 7 second timer for the connection test
@@ -1435,14 +1561,15 @@ class TelemetryCaptureSettingsWidget(QtWidgets.QWidget):
         self._directoryPath = path
         self._directoryLabel.setText(path)
 
-    def onCollected(self, fdp: ForzaDataPacket):
-        """Called when a single valid Forza Data Packet is collected"""
+    def onCollected(self, fdps: list):
+        """Called with each batch of valid Forza Data Packets collected"""
 
-        logging.debug("onCollected: Received FDP")
+        logging.debug(f"onCollected: Received {len(fdps)} FDPs")
 
+        # Report every 60 packets, which may fall anywhere within a batch
         packets = self._telemetryCapture.getPacketsCollected()
-        if packets % 60 == 0:
-            self._testDisplay.insertPlainText(f"Collected {packets} packets\n")
+        if packets // 60 != (packets - len(fdps)) // 60:
+            self._testDisplay.insertPlainText(f"Collected {packets - packets % 60} packets\n")
 
     def onActiveChanged(self, active: bool):
         """Called when the telemetry capture object changes its active status"""
@@ -29,6 +29,29 @@ from abc import ABC, abstractmethod
 from typing import Literal
 
 
+class CSVLoaderWorker(QRunnable):
+    """Reads a CSV file into a DataFrame off the GUI thread and emits it through the 'loaded' signal"""
+
+    class Signals(QObject):
+        """Signals for the CSVLoaderWorker"""
+        loaded = pyqtSignal(object)  # Emits the DataFrame read from the file
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__()
+        self.signals = CSVLoaderWorker.Signals()
+        self.path = path
+        self.kwargs = kwargs  # Passed on to pd.read_csv
+
+    def run(self):
+        """Reads the file and emits the DataFrame"""
+        try:
+            data = pd.read_csv(self.path, **self.kwargs)
+        except Exception:
+            logging.exception("Could not read {}".format(self.path))
+            return
+        self.signals.loaded.emit(data)
+
+
 class AnalyseModeWidget(QtWidgets.QFrame):
     """Provides an interface for analysing forza telemetry files and footage"""
 
@@ -132,9 +155,17 @@ class MainWindow(QtWidgets.QMainWindow):
         self._closeTimer = QTimer()
         self._closeTimer.timeout.connect(self._onCloseTimerTimeout)
 
-        # A DataFrame containing all the track details
+        # A DataFrame containing all the track details. It is read in the background so it doesn't delay showing the
+        # window, and is None until it has loaded
         trackDetailsPath = parentDir / pathlib.Path("config/track-details.csv")
-        self.forzaTrackDetails = pd.read_csv(str(trackDetailsPath), index_col="ordinal")
+        self.forzaTrackDetails: pd.DataFrame | None = None
+        self._trackDetailsWorker = CSVLoaderWorker(str(trackDetailsPath), index_col="ordinal")
+        self._trackDetailsWorker.setAutoDelete(False)
+        self._trackDetailsWorker.signals.loaded.connect(self._onTrackDetailsLoaded)
+        QThreadPool.globalInstance().start(self._trackDetailsWorker)
+
+        # The directory holding the toolbar and menu icons
+        iconsDir = parentDir / pathlib.Path("assets/icons")
 
         # Set the icon and title
         self.setWindowIcon(QIcon(str(parentDir / pathlib.Path("assets/images/Forza-logo-512.png"))))
@@ -196,13 +227,13 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setStatusBar(QtWidgets.QStatusBar(self))
 
         # Action to configure capture settings - open a dialog to set port number, footage source etc
-        configureCaptureAction = QAction(QIcon(str(parentDir / pathlib.Path("assets/icons/gear.png"))), "Capture Settings", self)
+        configureCaptureAction = QAction(QIcon(str(iconsDir / "gear.png")), "Capture Settings", self)
         configureCaptureAction.setStatusTip("Configure Capture Settings: Change the settings used for capturing race footage and telemetry.")
         configureCaptureAction.triggered.connect(self.configureCaptureSettings)
         toolbar.addAction(configureCaptureAction)
 
         # Action to start or stop telemetry and footage recording (Actually saving to files, not just capturing packets)
-        toggleCaptureAction = QAction(QIcon(str(parentDir / pathlib.Path("assets/icons/control-record.png"))), "Capture", self)
+        toggleCaptureAction = QAction(QIcon(str(iconsDir / "control-record.png")), "Capture", self)
         toggleCaptureAction.setStatusTip("Start/Stop Capture: Start/Stop capturing race footage and telemetry data.")
         toggleCaptureAction.setCheckable(True)
         toggleCaptureAction.triggered.connect(self.captureManager.toggleCapture)
@@ -211,14 +242,14 @@ class MainWindow(QtWidgets.QMainWindow):
         toolbar.addSeparator()
 
         # Action to open new sessions and replace any opened ones, to load the telemetry csv files and the associated mp4 video with the same name
-        openNewSessionsAction = QAction(QIcon(str(parentDir / pathlib.Path("assets/icons/folder-open-document.png"))), "New Sessions", self)
+        openNewSessionsAction = QAction(QIcon(str(iconsDir / "folder-open-document.png")), "New Sessions", self)
         openNewSessionsAction.setShortcut(QKeySequence("Ctrl+O"))
         openNewSessionsAction.setStatusTip("Open New Sessions: Opens new CSV telemetry files (and video if there is one) to be analysed, replacing any currently opened sessions.")
         #openNewSessionsAction.triggered.connect(self.sessionManager.openNewSessions)
         toolbar.addAction(openNewSessionsAction)
 
         # Action to add sessions to be analysed
-        addNewSessionsAction = QAction(QIcon(str(parentDir / pathlib.Path("assets/icons/folder--plus.png"))), "Add Sessions", self)
+        addNewSessionsAction = QAction(QIcon(str(iconsDir / "folder--plus.png")), "Add Sessions", self)
         #addNewSessionsAction.setShortcut(QKeySequence("Ctrl+O"))
         addNewSessionsAction.setStatusTip("Add Sessions: Adds new CSV telemetry files (and video if there is one) to be analysed.")
         #openNewSessionsAction.triggered.connect(self.sessionManager.openNewSessions)
@@ -227,7 +258,7 @@ class MainWindow(QtWidgets.QMainWindow):
         toolbar.addSeparator()
 
         # Action to play/pause the videos and animate the graphs
-        playPauseAction = QAction(QIcon(str(parentDir / pathlib.Path("assets/icons/control-play-pause.png"))), "Play/Pause", self)
+        playPauseAction = QAction(QIcon(str(iconsDir / "control-play-pause.png")), "Play/Pause", self)
         playPauseAction.setCheckable(True)
         playPauseAction.setShortcut(QKeySequence("Space"))
         playPauseAction.setStatusTip("Play/Pause Button: Plays or pauses the footage and the telemetry graphs.")
@@ -235,7 +266,7 @@ class MainWindow(QtWidgets.QMainWindow):
         toolbar.addAction(playPauseAction)
 
         # Action to stop and skip to the beginning of the footage
-        stopAction = QAction(QIcon(str(parentDir / pathlib.Path("assets/icons/control-stop.png"))), "Stop", self)
+        stopAction = QAction(QIcon(str(iconsDir / "control-stop.png")), "Stop", self)
         stopAction.setStatusTip("Stop Button: Stops the footage and skips to the beginning.")
         #stopAction.triggered.connect(self.videoPlayer.stop)
         toolbar.addAction(stopAction)
@@ -247,7 +278,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.addToolBar(modeBar)
 
         # Action to switch to the analyse mode
-        analyseModeAction = QAction(QIcon(str(parentDir / pathlib.Path("assets/icons/magnifier.png"))), "Analyse Mode", self)
+        analyseModeAction = QAction(QIcon(str(iconsDir / "magnifier.png")), "Analyse Mode", self)
         analyseModeAction.setStatusTip("Analyse Mode: Switch to Analyse Mode to view footage and telemetry from saved sessions.")
         #analyseModeAction.setCheckable(True)
         analyseModeAction.setChecked(True)
@@ -255,7 +286,7 @@ class MainWindow(QtWidgets.QMainWindow):
         modeBar.addAction(analyseModeAction)
 
         # Action to switch to the record mode
-        captureModeAction = QAction(QIcon(str(parentDir / pathlib.Path("assets/icons/script-attribute-c.png"))), "Capture Mode", self)
+        captureModeAction = QAction(QIcon(str(iconsDir / "script-attribute-c.png")), "Capture Mode", self)
         captureModeAction.setStatusTip("Capture Mode: Switch to Capture Mode to view live footage and telemetry.")
         #captureModeAction.setCheckable(True)
         captureModeAction.triggered.connect(self.setModeCapture)
@@ -285,6 +316,10 @@ class MainWindow(QtWidgets.QMainWindow):
         # Contains actions to open/close the dock widgets
         viewMenu = menu.addMenu("&View")
     
+    def _onTrackDetailsLoaded(self, trackDetails: pd.DataFrame):
+        """Stores the track details once they have been read"""
+        self.forzaTrackDetails = trackDetails
+
     def configureCaptureSettings(self):
         """Opens a dialog to configure capture settings and applies them if accepted"""
         captureDialog = CaptureDialog()
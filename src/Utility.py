@@ -4,6 +4,7 @@ from PyQt6.QtMultimedia import QCameraFormat
 from PyQt6.QtGui import QIcon, QColor, QPixmap
 import socket
 from math import floor
+from functools import lru_cache
 from typing import Literal
 
 
@@ -175,8 +176,10 @@ def QCameraFormatToStr(format: QCameraFormat):
         frameRate)
     return result
 
+@lru_cache(maxsize=4096)
 def formatLapTime(lapTime: float) -> str:
-    """Formats a lap time as a float type into a readable string format of type MM:ss.mmmm"""
+    """Formats a lap time as a float type into a readable string format of type MM:ss.mmmm. Results are cached, as
+    the same lap times are formatted every time a view is repainted"""
     minutes, seconds = divmod(lapTime, 60)
     mseconds = str(seconds - floor(seconds))  # gets us the decimal part
     mseconds = mseconds[2:5]
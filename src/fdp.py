@@ -17,7 +17,7 @@ U16 -> H
 S8 -> b
 '''
 
-from struct import unpack
+from struct import Struct
 
 ## Documentation of the packet format is available on either
 ## Forza 7: https://web.archive.org/web/20211203164310/https://forums.forzamotorsport.net/turn10_postst128499_Forza-Motorsport-7--Data-Out--feature-details.aspx
@@ -33,6 +33,10 @@ class ForzaDataPacket:
 
     ## Format string for the V2 format called 'car dash' (last 5 added for FM8)
     dash_format = '<iIfffffffffffffffffffffffffffffffffffffffffffffffffffiiiiifffffffffffffffffHBBBBBBbbbffffi'
+
+    ## Compiled versions of the formats, so they aren't parsed again for every packet
+    sled_struct = Struct(sled_format)
+    dash_struct = Struct(dash_format)
     
     ## Names of the properties in the order they're featured in the packet:
     sled_props = [
@@ -89,17 +93,17 @@ class ForzaDataPacket:
         ## values in the data packet:
         if packet_format == 'sled':
             for prop_name, prop_value in zip(self.sled_props,
-                                             unpack(self.sled_format, data)):
+                                             self.sled_struct.unpack(data)):
                 setattr(self, prop_name, prop_value)
         elif packet_format == 'fh4':
             patched_data = data[:232] + data[244:323]
             for prop_name, prop_value in zip(self.sled_props + self.dash_props,
-                                             unpack(self.dash_format,
+                                             self.dash_struct.unpack(
                                                     patched_data)):
                 setattr(self, prop_name, prop_value)
         else:
             for prop_name, prop_value in zip(self.sled_props + self.dash_props,
-                                             unpack(self.dash_format, data)):
+                                             self.dash_struct.unpack(data)):
                 setattr(self, prop_name, prop_value)
 
     @classmethod
@@ -11,18 +11,28 @@ import Utility
 class DataFrameModel(QAbstractTableModel):
     """A Table Model representing a pandas DataFrame"""
 
+    # The number of rows converted to display strings at a time, and the most blocks of strings kept at once
+    blockRows = 1024
+    maxCachedBlocks = 512
+
     def __init__(self, parent = None):
         super().__init__(parent)
 
         # The data that the model will represent
         self.frame: pd.DataFrame | None = None
+
+        # The display strings of blocks of cells, keyed by (column, block). Blocks are only created the first time
+        # one of their cells is painted, so large frames never have every cell converted
+        self._stringBlocks: dict[tuple[int, int], np.ndarray] = {}
+
+        # The header labels of each column
+        self._columnLabels: list[str] = []
     
     def data(self, index, role):
-        if role == Qt.ItemDataRole.DisplayRole:
-            if self.frame is None:
-                return None
-            value = self.frame.iat[index.row(), index.column()]
-            return str(value)
+        # Only the display role is provided, so return before anything else for the many other roles Qt asks for
+        if role != Qt.ItemDataRole.DisplayRole or self.frame is None:
+            return None
+        return self._cellString(index.row(), index.column())
     
     def rowCount(self, index):
         if self.frame is None:
@@ -37,19 +47,81 @@ class DataFrameModel(QAbstractTableModel):
     def headerData(self, section, orientation, role):
         # section is the index of the column/row.
         if role == Qt.ItemDataRole.DisplayRole:
+            if self.frame is None:
+                return None
+
             if orientation == Qt.Orientation.Horizontal:
-                label = str(self.frame.columns[section]).replace("_", " ").title()
-                return label
+                return self._columnLabels[section]
 
             if orientation == Qt.Orientation.Vertical:
                 return str(self.frame.index[section])
 
-    def updateData(self, data: pd.DataFrame):
-        """Replaces the data currently held in the model with a copy of the supplied DataFrame"""
+    def updateData(self, data: pd.DataFrame, copy: bool = False):
+        """Replaces the data currently held in the model with the supplied DataFrame. The model takes ownership of the
+        DataFrame, so the caller shouldn't modify it afterwards. Set copy to True to hold a copy instead."""
+        data = data.copy() if copy else data
+
+        # If the shape of the table hasn't changed, views only need to re-fetch the cells instead of being reset
+        if self.frame is not None and self.frame.shape == data.shape and self.frame.columns.equals(data.columns):
+            self.frame = data
+            self._cacheFrame()
+            if not data.empty:
+                self.dataChanged.emit(self.index(0, 0), self.index(data.shape[0] - 1, data.shape[1] - 1))
+                self.headerDataChanged.emit(Qt.Orientation.Vertical, 0, data.shape[0] - 1)
+            return
+
         self.beginResetModel()
-        self.frame = data.copy()
+        self.frame = data
+        self._cacheFrame()
         self.endResetModel()
 
+    def _cacheFrame(self):
+        """Rebuilds anything derived from the frame. Called whenever the frame is replaced, before views are told
+        about the change"""
+        self._stringBlocks = {}
+        self._columnLabels = [str(column).replace("_", " ").title() for column in self.frame.columns]
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        """Sorts the rows of the model by a column. Sorting is done on the DataFrame itself, so views don't need a
+        QSortFilterProxyModel querying data() for every cell to sort it"""
+        if self.frame is None:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+
+        ascending = order == Qt.SortOrder.AscendingOrder
+        values = self.frame.iloc[:, column].reset_index(drop=True)
+        rowOrder = values.sort_values(ascending=ascending, kind="stable").index.to_numpy()
+        self.frame = self.frame.iloc[rowOrder]
+        self._cacheFrame()
+
+        # Move any persistent indexes (eg. the selection) to the new positions of their rows
+        newRows = np.empty(len(rowOrder), dtype=int)
+        newRows[rowOrder] = np.arange(len(rowOrder))
+        oldIndexes = self.persistentIndexList()
+        newIndexes = [self.index(int(newRows[i.row()]), i.column()) for i in oldIndexes]
+        self.changePersistentIndexList(oldIndexes, newIndexes)
+
+        self.layoutChanged.emit()
+
+    def _cellString(self, row: int, column: int) -> str:
+        """Returns the display string of a cell, converting the block of rows it is in if that hasn't been done yet"""
+        block, offset = divmod(row, self.blockRows)
+        strings = self._stringBlocks.get((column, block))
+        if strings is None:
+            # Start again once the cache is full, so scrolling through a large frame doesn't keep every string
+            if len(self._stringBlocks) >= self.maxCachedBlocks:
+                self._stringBlocks.clear()
+            start = block * self.blockRows
+            strings = self._formatBlock(column, start, start + self.blockRows)
+            self._stringBlocks[(column, block)] = strings
+        return strings[offset]
+
+    def _formatBlock(self, column: int, start: int, stop: int) -> np.ndarray:
+        """Returns the display strings for the rows start to stop of a column. Each column is converted with its own
+        dtype, so values are shown the same as str() of the cell"""
+        return self.frame.iloc[start:stop, column].astype(str).to_numpy()
+
     def getDataFrame(self):
         """Returns the DataFrame"""
         return self.frame
@@ -57,23 +129,41 @@ class DataFrameModel(QAbstractTableModel):
 
 class LapDetailsModel(DataFrameModel):
     """A table model representing the data for a group of laps"""
+
+    # The background colour of the fastest lap
+    fastestLapColour = QColor("purple")
     
     def __init__(self, parent=None):
         super().__init__(parent)
+
+        # Whether each row holds the fastest lap, so it isn't searched for on every paint
+        self._fastestLapRows: np.ndarray | None = None
+
+    def _cacheFrame(self):
+        super()._cacheFrame()
+        self._fastestLapRows = None
+        if "lap_time" in self.frame and self.frame.shape[1] > 4:
+            minLapTime = self.frame["lap_time"].min()
+            self._fastestLapRows = self.frame.iloc[:, 4].to_numpy() == minLapTime
+    
+    def _formatBlock(self, column: int, start: int, stop: int) -> np.ndarray:
+        if column == 5:
+            values = self.frame.iloc[start:stop, column].to_numpy()
+            return np.array([Utility.formatLapTime(value) for value in values], dtype=object)
+        return super()._formatBlock(column, start, stop)
     
     def data(self, index: QModelIndex, role):
+        # Qt queries every role for each visible cell, so return early for all the roles this model doesn't provide
+        if role != Qt.ItemDataRole.DisplayRole and role != Qt.ItemDataRole.BackgroundRole:
+            return None
+
         if self.frame is None:
-                return None
+            return None
         
         if role == Qt.ItemDataRole.DisplayRole:
-            value = self.frame.iat[index.row(), index.column()]
-            if index.column() == 5:
-                value = Utility.formatLapTime(value)
-            return str(value)
+            return self._cellString(index.row(), index.column())
         
         if role == Qt.ItemDataRole.BackgroundRole:
-            if index.column() == 4:
-                value = self.frame.iat[index.row(), index.column()]
-                minLapTime = self.frame["lap_time"].min()
-                if value == minLapTime:
-                    return QColor("purple")
+            if index.column() == 4 and self._fastestLapRows is not None:
+                if self._fastestLapRows[index.row()]:
+                    return self.fastestLapColour